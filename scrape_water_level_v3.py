@@ -3,15 +3,28 @@
 
 import time
 import os
+import argparse
 import logging
 import sys
-import pandas as pd
 from datetime import datetime
+import csv
 import subprocess
 import json
+import base64
+import codecs
 import re
 import random
+import shutil
+import tempfile
+import atexit
+import threading
+from types import MappingProxyType
+import queue
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+from lxml import etree, html
 
 # Try to import Selenium components, but continue if not available
 try:
@@ -21,8 +34,8 @@ try:
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, WebDriverException
     from webdriver_manager.chrome import ChromeDriverManager
-    from bs4 import BeautifulSoup
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
@@ -34,58 +47,279 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
     handlers=[logging.StreamHandler(sys.stdout)]
 )
+# The format shows neither, so log records don't need to look them up
+logging.logThreads = False
+logging.logProcesses = False
 
 # Define your output directory (relative path for GitHub Actions)
 OUTPUT_DIR = "data"
 
+# Set once the output directory has been created by this process
+_OUTPUT_DIR_READY = False
+
+# Dump the fetched page to data/debug_page.html (SCRAPE_DEBUG=1 or --debug-html)
+DEBUG_HTML = os.environ.get('SCRAPE_DEBUG') == '1'
+_DEBUG_HTML_LOCK = threading.Lock()
+
+# Column order of the CSV output
+CSV_COLUMNS = ['Location', 'Water Level (Feet)', 'Date & Time']
+
+# Resolved ChromeDriver binary, looked up once per process
+_CHROMEDRIVER_PATH = None
+
+# Chrome profile kept between runs so warm starts reuse its DNS and HTTP caches
+CHROME_PROFILE_DIR = os.environ.get('CHROME_PROFILE_DIR', os.path.expanduser("~/.cache/vmc-scraper-chrome"))
+
+# Last strategy that returned data, tried on its own first while it is fresh
+STRATEGY_CACHE_FILE = os.environ.get('STRATEGY_CACHE_FILE', os.path.expanduser("~/.cache/vmc-scraper-strategy.json"))
+STRATEGY_CACHE_TTL = 2 * 24 * 3600  # Outlives the daily schedule by a day
+
+# Last page body and its ETag/Last-Modified, for conditional requests
+HTTP_CACHE_DIR = os.environ.get('HTTP_CACHE_DIR', os.path.expanduser("~/.cache/vmc-scraper-http"))
+
+# Resources Chrome does not need to fetch to render the water level table
+BLOCKED_RESOURCE_URLS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.woff', '*.woff2', '*.ttf', '*.css', '*.ico']
+
+# Headers based on the successful request, shared by every plain HTTP strategy.
+# Read-only, so no strategy can change them for the others. Accept-Encoding is
+# left to each client, so it only lists encodings that client can decode
+HEADERS = MappingProxyType({
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Cache-Control": "max-age=0",
+    "Connection": "keep-alive",
+    "Host": "vmc.gov.in",  # Important: keep the original host header for the IP address strategy
+    "Referer": "https://www.google.com/",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "cross-site",
+    "Sec-Fetch-User": "?1",
+    "Upgrade-Insecure-Requests": "1",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36",
+    "sec-ch-ua": '"Not;A=Brand";v="99", "Google Chrome";v="139", "Chromium";v="139"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"'
+})
+
+# Named hidden inputs carry the ASP.NET form state for the postback strategy
+HIDDEN_INPUTS = etree.XPath('//input[@type="hidden"][@name]')
+
+# Markers of a useful page, matched without lower-casing a copy of the body
+_EXPECTED_CONTENT_RE = re.compile(rb'<table|water level', re.IGNORECASE)
+
+# Charset parameter of a Content-Type header
+_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+# (connect, read) timeouts for the plain HTTP strategies. An unreachable host
+# fails after the short connect timeout instead of holding the strategy for 30 s
+REQUEST_TIMEOUT = (5, 30)
+
+# Address of vmc.gov.in from the successful request, for the IP address strategy
+VMC_IP_ADDRESS = "136.233.132.36"
+
+# Free Indian proxies (these may need to be updated periodically)
+INDIAN_PROXIES = (
+    "103.155.217.29:80",
+    "139.59.67.6:8080",
+    "139.59.16.235:3128",
+    "164.52.24.179:80",
+    "103.250.172.46:8080"
+)
+
+# Proxies that did not answer, with the time they failed. Later attempts in the
+# same run leave them out until PROXY_RETRY_AFTER has passed
+_DEAD_PROXIES = {}
+PROXY_RETRY_AFTER = 3600
+
+class HostHeaderSSLAdapter(HTTPAdapter):
+    """HTTPS adapter that connects to an IP address but sends SNI and checks the certificate for vmc.gov.in"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['server_hostname'] = "vmc.gov.in"
+        kwargs['assert_hostname'] = "vmc.gov.in"
+        super().init_poolmanager(*args, **kwargs)
+
+# Transient 429/5xx answers are retried on the session with jittered
+# exponential backoff, before the strategy gives up and the next one runs.
+# Connect and read failures are not retried, so a dead host still fails after
+# one REQUEST_TIMEOUT and the next strategy or proxy takes over
+RETRY_STRATEGY = Retry(
+    total=3,
+    connect=0,
+    read=0,
+    other=0,
+    status=3,
+    backoff_factor=1.0,
+    backoff_jitter=1.0,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset({'GET', 'HEAD'}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+# One pooled session for all plain HTTP strategies, so retries and later
+# strategies reuse the open keep-alive connection instead of a new TLS handshake
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+# Only advertise what urllib3 can decode here: br and zstd need brotli and zstandard installed
+_SESSION.headers['Accept-Encoding'] = ACCEPT_ENCODING
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=RETRY_STRATEGY))
+_SESSION.mount(f"https://{VMC_IP_ADDRESS}/", HostHeaderSSLAdapter(max_retries=RETRY_STRATEGY))
+
 # Log version information
 logging.info("VMC Water Level Scraper v10.0.0")
 logging.info("Scraping from: https://vmc.gov.in/waterlevelsensor/WaterLevel.aspx")
 
+def first_successful(tasks):
+    """
+    Run tasks on background threads and return the first one that succeeds.
+    
+    Args:
+        tasks (list): (name, callable) pairs. A callable succeeds by returning a truthy value.
+    
+    Returns:
+        tuple: (name, result) of the first successful task, or (None, None) if all failed
+    """
+    results = queue.Queue()
+    
+    def run(name, task):
+        try:
+            result = task()
+        except Exception as e:
+            logging.error(f"Error in {name}: {str(e)}")
+            result = None
+        results.put((name, result))
+    
+    # Daemon threads, so tasks still waiting on their timeouts do not hold up the exit
+    for name, task in tasks:
+        threading.Thread(target=run, args=(name, task), name=name, daemon=True).start()
+    
+    # Failing tasks now cost the slowest timeout instead of the sum of all of them
+    for _ in tasks:
+        name, result = results.get()
+        if result:
+            return name, result
+    
+    return None, None
+
+def get_session():
+    """Return the shared requests session used by the plain HTTP strategies"""
+    return _SESSION
+
+def has_expected_content(content):
+    """Check whether raw page bytes look like they hold the water level table"""
+    return _EXPECTED_CONTENT_RE.search(content) is not None
+
+def header_charset(content_type):
+    """
+    Get the charset declared in a Content-Type header.
+    
+    Args:
+        content_type (str): Value of the header, may be None
+    
+    Returns:
+        str: The charset, or None if the header has no usable one and lxml
+            should go by the page's own meta tag
+    """
+    match = _CHARSET_RE.search(content_type or '')
+    if not match:
+        return None
+    try:
+        codecs.lookup(match.group(1))
+    except LookupError:
+        return None
+    return match.group(1)
+
+def load_validators():
+    """Return the validators saved with the cached page, empty if there are none"""
+    try:
+        with open(os.path.join(HTTP_CACHE_DIR, "validators.json"), encoding='utf-8') as f:
+            validators = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return validators if isinstance(validators, dict) else {}
+
+def conditional_request_headers():
+    """
+    Build If-None-Match / If-Modified-Since headers from the cached page.
+    
+    Returns:
+        dict: Conditional request headers, empty if there is no cached page
+    """
+    validators = load_validators()
+    
+    # A 304 is only useful if the body it refers to is still there
+    if not os.path.exists(os.path.join(HTTP_CACHE_DIR, "page.html")):
+        return {}
+    
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+def load_cached_page():
+    """Return the cached page body and its header charset, or None if it is missing"""
+    try:
+        with open(os.path.join(HTTP_CACHE_DIR, "page.html"), 'rb') as f:
+            content = f.read()
+    except OSError:
+        return None
+    return content, load_validators().get('encoding')
+
+def save_cached_page(response):
+    """Keep the page body and its validators, if the server sent any, for the next run"""
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if not etag and not last_modified:
+        return
+    
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        with open(os.path.join(HTTP_CACHE_DIR, "page.html"), 'wb') as f:
+            f.write(response.content)
+        with open(os.path.join(HTTP_CACHE_DIR, "validators.json"), 'w', encoding='utf-8') as f:
+            json.dump({
+                'etag': etag,
+                'last_modified': last_modified,
+                'encoding': header_charset(response.headers.get('Content-Type')),
+            }, f)
+    except OSError as e:
+        logging.warning(f"Could not cache the page: {str(e)}")
+
 def try_with_targeted_request():
-    """Try to access the website using the specific successful request parameters"""
+    """
+    Try to access the website using the specific successful request parameters.
+    
+    Returns:
+        tuple: (page bytes, charset from the Content-Type header or None), or None
+    """
     logging.info("Trying with targeted request parameters")
     
     url = "https://vmc.gov.in/waterlevelsensor/WaterLevel.aspx"
     
-    # Headers based on the successful request
-    headers = {
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-        "Accept-Encoding": "gzip, deflate, br, zstd",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cache-Control": "max-age=0",
-        "Connection": "keep-alive",
-        "Host": "vmc.gov.in",
-        "Referer": "https://www.google.com/",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "cross-site",
-        "Sec-Fetch-User": "?1",
-        "Upgrade-Insecure-Requests": "1",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36",
-        "sec-ch-ua": '"Not;A=Brand";v="99", "Google Chrome";v="139", "Chromium";v="139"',
-        "sec-ch-ua-mobile": "?0",
-        "sec-ch-ua-platform": '"Windows"'
-    }
-    
     # Try with requests library first
     try:
         logging.info("Trying with requests library")
-        session = requests.Session()
         
-        # Set a custom referrer policy
-        session.headers.update(headers)
+        # Make the request, conditional on the copy from the last run
+        response = _SESSION.get(url, headers=conditional_request_headers(), timeout=REQUEST_TIMEOUT)
         
-        # Make the request
-        response = session.get(url, timeout=30)
+        if response.status_code == 304:
+            page = load_cached_page()
+            if page:
+                logging.info("Page not modified since the last run, using the cached copy")
+                return page
         
         if response.status_code == 200:
-            content = response.text
+            content = response.content
             
             # Check if the content looks useful
-            if "<table" in content.lower() or "water level" in content.lower():
+            if has_expected_content(content):
                 logging.info("Success with requests library")
-                return content
+                save_cached_page(response)
+                return content, header_charset(response.headers.get('Content-Type'))
             else:
                 logging.warning("Response doesn't contain expected content")
         else:
@@ -99,28 +333,30 @@ def try_with_targeted_request():
         logging.info("Trying with curl")
         
         # Build curl command with all headers
-        cmd = ["curl", "-L", "-s", "-S", "--connect-timeout", "30", "--max-time", "60"]
+        cmd = ["curl", "-L", "-s", "-S", "--compressed", "--connect-timeout", str(REQUEST_TIMEOUT[0]), "--max-time", "60"]
+        # Append the final Content-Type after the body, for its charset
+        cmd.extend(["-w", "\n%{content_type}"])
         
-        # Add all headers
-        for key, value in headers.items():
+        # Add all headers, --compressed asks for the encodings this curl can decode
+        for key, value in HEADERS.items():
             cmd.extend(["-H", f"{key}: {value}"])
         
         # Add URL
         cmd.append(url)
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=90)
+        result = subprocess.run(cmd, capture_output=True, timeout=90)
         
         if result.returncode == 0:
-            content = result.stdout
+            content, _, content_type = result.stdout.rpartition(b"\n")
             
             # Check if the content looks useful
-            if "<table" in content.lower() or "water level" in content.lower():
+            if has_expected_content(content):
                 logging.info("Success with curl")
-                return content
+                return content, header_charset(content_type.decode('ascii', errors='replace'))
             else:
                 logging.warning("Response doesn't contain expected content")
         else:
-            logging.warning(f"Curl failed: {result.stderr}")
+            logging.warning(f"Curl failed: {result.stderr.decode(errors='replace')}")
             
     except Exception as e:
         logging.error(f"Error with curl: {str(e)}")
@@ -129,49 +365,31 @@ def try_with_targeted_request():
     return None
 
 def try_with_ip_address():
-    """Try to access the website using the specific IP address"""
+    """
+    Try to access the website using the specific IP address.
+    
+    Returns:
+        tuple: (page bytes, charset from the Content-Type header or None), or None
+    """
     logging.info("Trying with specific IP address")
     
-    # Use the IP address from the successful request
-    ip_address = "136.233.132.36"
-    url = f"https://{ip_address}/waterlevelsensor/WaterLevel.aspx"
-    
-    # Headers based on the successful request
-    headers = {
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-        "Accept-Encoding": "gzip, deflate, br, zstd",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cache-Control": "max-age=0",
-        "Connection": "keep-alive",
-        "Host": "vmc.gov.in",  # Important: keep the original host header
-        "Referer": "https://www.google.com/",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "cross-site",
-        "Sec-Fetch-User": "?1",
-        "Upgrade-Insecure-Requests": "1",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36",
-        "sec-ch-ua": '"Not;A=Brand";v="99", "Google Chrome";v="139", "Chromium";v="139"',
-        "sec-ch-ua-mobile": "?0",
-        "sec-ch-ua-platform": '"Windows"'
-    }
+    # The adapter mounted for this address keeps SNI and certificate checks on vmc.gov.in
+    url = f"https://{VMC_IP_ADDRESS}/waterlevelsensor/WaterLevel.aspx"
     
     # Try with requests library
     try:
         logging.info("Trying with requests library and IP address")
-        session = requests.Session()
-        session.headers.update(headers)
         
         # Make the request to the IP address
-        response = session.get(url, timeout=30)
+        response = _SESSION.get(url, timeout=REQUEST_TIMEOUT)
         
         if response.status_code == 200:
-            content = response.text
+            content = response.content
             
             # Check if the content looks useful
-            if "<table" in content.lower() or "water level" in content.lower():
+            if has_expected_content(content):
                 logging.info("Success with requests library and IP address")
-                return content
+                return content, header_charset(response.headers.get('Content-Type'))
             else:
                 logging.warning("Response doesn't contain expected content")
         else:
@@ -180,150 +398,482 @@ def try_with_ip_address():
     except Exception as e:
         logging.error(f"Error with requests library and IP address: {str(e)}")
     
-    # Try with curl
+    logging.error("All attempts with IP address failed")
+    return None
+
+def fetch_via_proxy(proxy):
+    """
+    Fetch the water level page through one proxy on the shared session.
+    
+    Args:
+        proxy (str): Proxy address as host:port
+    
+    Returns:
+        tuple: (page bytes, charset from the Content-Type header or None),
+            or None if the proxy failed or returned something else
+    """
+    url = "https://vmc.gov.in/waterlevelsensor/WaterLevel.aspx"
+    proxy_url = f"http://{proxy}"
+    
+    logging.info(f"Trying proxy {proxy}")
+    start = time.perf_counter()
+    
+    try:
+        response = _SESSION.get(url, proxies={"http": proxy_url, "https": proxy_url}, timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        logging.warning(f"Proxy {proxy} failed after {time.perf_counter() - start:.2f}s: {str(e)}")
+        _DEAD_PROXIES[proxy] = time.time()
+        return None
+    
+    _DEAD_PROXIES.pop(proxy, None)
+    
+    if response.status_code != 200:
+        logging.warning(f"Proxy {proxy} failed with status code {response.status_code} after {time.perf_counter() - start:.2f}s")
+        return None
+    
+    content = response.content
+    
+    # Check if the content looks useful
+    if has_expected_content(content):
+        logging.info(f"Success with proxy {proxy} in {time.perf_counter() - start:.2f}s")
+        return content, header_charset(response.headers.get('Content-Type'))
+    
+    logging.warning(f"Response from proxy {proxy} doesn't contain expected content")
+    return None
+
+def try_with_indian_proxy():
+    """Try to access the website through all Indian proxies at once"""
+    logging.info("Trying with Indian proxy")
+    
+    # Skip the proxies that recently failed to answer, unless none are left
+    now = time.time()
+    proxies = [proxy for proxy in INDIAN_PROXIES if now - _DEAD_PROXIES.get(proxy, 0) > PROXY_RETRY_AFTER]
+    if not proxies:
+        proxies = INDIAN_PROXIES
+    elif len(proxies) < len(INDIAN_PROXIES):
+        logging.info(f"Skipping {len(INDIAN_PROXIES) - len(proxies)} proxies that recently failed")
+    
+    # The first proxy to answer wins, the slow or dead ones are left to time out
+    proxy, page = first_successful([(f"proxy {proxy}", lambda proxy=proxy: fetch_via_proxy(proxy)) for proxy in proxies])
+    if page:
+        return page
+    
+    logging.error("All Indian proxies failed")
+    return None
+
+def try_with_postback(html_content, encoding=None):
+    """
+    Emulate the ASP.NET postback of a previously fetched page without a browser.
+    
+    Args:
+        html_content (bytes): HTML of the fetched page
+        encoding (str): Charset from the page's Content-Type header, if it had one
+    
+    Returns:
+        tuple: (page bytes, charset from the Content-Type header or None), or None
+    """
+    logging.info("Trying with ASP.NET postback")
+    
+    url = "https://vmc.gov.in/waterlevelsensor/WaterLevel.aspx"
+    
     try:
-        logging.info("Trying with curl and IP address")
+        # Collect the hidden WebForms state (__VIEWSTATE, __EVENTVALIDATION, ...)
+        hidden_inputs = HIDDEN_INPUTS(html.fromstring(html_content, parser=html.HTMLParser(encoding=encoding)))
+        form = {field.get('name'): field.get('value', '') for field in hidden_inputs}
         
-        # Build curl command with all headers
-        cmd = ["curl", "-L", "-s", "-S", "--connect-timeout", "30", "--max-time", "60", "--resolve", f"vmc.gov.in:443:{ip_address}"]
+        if '__VIEWSTATE' not in form:
+            logging.warning("Page has no __VIEWSTATE, nothing to post back")
+            return None
         
-        # Add all headers
-        for key, value in headers.items():
-            cmd.extend(["-H", f"{key}: {value}"])
+        form.setdefault('__EVENTTARGET', '')
+        form.setdefault('__EVENTARGUMENT', '')
         
-        # Add URL
-        cmd.append("https://vmc.gov.in/waterlevelsensor/WaterLevel.aspx")
+        # Post back to the page itself, as the browser would
+        headers = {
+            "Origin": "https://vmc.gov.in",
+            "Referer": url,
+            "Sec-Fetch-Site": "same-origin",
+        }
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=90)
+        response = _SESSION.post(url, data=form, headers=headers, timeout=REQUEST_TIMEOUT)
         
-        if result.returncode == 0:
-            content = result.stdout
+        if response.status_code == 200:
+            content = response.content
             
             # Check if the content looks useful
-            if "<table" in content.lower() or "water level" in content.lower():
-                logging.info("Success with curl and IP address")
-                return content
+            if has_expected_content(content):
+                logging.info("Success with ASP.NET postback")
+                return content, header_charset(response.headers.get('Content-Type'))
             else:
-                logging.warning("Response doesn't contain expected content")
+                logging.warning("Postback response doesn't contain expected content")
         else:
-            logging.warning(f"Curl failed: {result.stderr}")
-            
+            logging.warning(f"Postback failed with status code: {response.status_code}")
+    
     except Exception as e:
-        logging.error(f"Error with curl and IP address: {str(e)}")
+        logging.error(f"Error with ASP.NET postback: {str(e)}")
     
-    logging.error("All attempts with IP address failed")
     return None
 
-def try_with_indian_proxy():
-    """Try to access the website using an Indian proxy"""
-    logging.info("Trying with Indian proxy")
+def ensure_output_dir():
+    """Create the output directory on first use, later calls are free"""
+    global _OUTPUT_DIR_READY
+    if not _OUTPUT_DIR_READY:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        _OUTPUT_DIR_READY = True
+
+def save_debug_html(page_source):
+    """
+    Write the fetched page to the debug file on a background thread.
     
-    url = "https://vmc.gov.in/waterlevelsensor/WaterLevel.aspx"
+    Args:
+        page_source (bytes or str): The page. Bytes are written as received,
+            text is written as UTF-8
+    """
+    debug_file = os.path.join(OUTPUT_DIR, "debug_page.html")
+    if isinstance(page_source, str):
+        page_source = page_source.encode('utf-8')
     
-    # List of free Indian proxies (these may need to be updated periodically)
-    indian_proxies = [
-        "103.155.217.29:80",
-        "139.59.67.6:8080",
-        "139.59.16.235:3128",
-        "164.52.24.179:80",
-        "103.250.172.46:8080"
-    ]
+    def write():
+        ensure_output_dir()
+        # Strategies racing each other may dump at the same time, one write at a time
+        with _DEBUG_HTML_LOCK, open(debug_file, 'wb') as f:
+            f.write(page_source)
+        logging.info(f"Saved page content to {debug_file} for debugging")
     
-    # Shuffle the proxies to distribute load
-    random.shuffle(indian_proxies)
-    
-    # Headers based on the successful request
-    headers = {
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-        "Accept-Encoding": "gzip, deflate, br, zstd",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cache-Control": "max-age=0",
-        "Connection": "keep-alive",
-        "Host": "vmc.gov.in",
-        "Referer": "https://www.google.com/",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "cross-site",
-        "Sec-Fetch-User": "?1",
-        "Upgrade-Insecure-Requests": "1",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36",
-        "sec-ch-ua": '"Not;A=Brand";v="99", "Google Chrome";v="139", "Chromium";v="139"',
-        "sec-ch-ua-mobile": "?0",
-        "sec-ch-ua-platform": '"Windows"'
-    }
-    
-    for i, proxy in enumerate(indian_proxies):
-        try:
-            logging.info(f"Trying proxy {i+1}/{len(indian_proxies)}: {proxy}")
-            
-            # Try with curl using the proxy and exact headers
-            cmd = [
-                "curl",
-                "-L",
-                "-s",
-                "-S",
-                "--proxy", f"http://{proxy}",
-                "--connect-timeout", "30",
-                "--max-time", "60"
-            ]
-            
-            # Add all headers
-            for key, value in headers.items():
-                cmd.extend(["-H", f"{key}: {value}"])
-            
-            # Add URL
-            cmd.append(url)
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=90)
-            
-            if result.returncode == 0:
-                content = result.stdout
-                
-                # Check if the content looks useful
-                if "<table" in content.lower() or "water level" in content.lower():
-                    logging.info(f"Success with proxy {i+1}")
-                    return content
-                else:
-                    logging.warning(f"Response from proxy {i+1} doesn't contain expected content")
-            else:
-                logging.warning(f"Proxy {i+1} failed: {result.stderr}")
-                
-        except Exception as e:
-            logging.error(f"Error with proxy {i+1}: {str(e)}")
-            continue
+    # Not a daemon thread, so the interpreter still finishes the write on exit
+    threading.Thread(target=write, name="debug-html-writer").start()
+
+# Date/time cells that are just a number hold a misplaced reading, not a timestamp
+_NUMERIC_RE = re.compile(r'[\d.]+')
+
+# Locations from the original table, used for the mock data fallback
+_MOCK_LOCATIONS = (
+    "AJWA DAM",
+    "AKOTA BRIDGE",
+    "ASOJ FEEDER",
+    "BAHUCHARAJI BRIDGE",
+    "KALA GHODA",
+    "MANGAL PANDEY BRIDGE",
+    "MUJMAUDA BRIDGE",
+    "PRATAPPURA DAM",
+    "SAMA HARNI BRIDGE",
+    "VADSAR BRIDGE"
+)
+
+# Table lookups for pages without GridView1, tried in order. They run in
+# lxml, so no Python-level walk over the document is needed to find the table
+_LOWER = "translate(%s, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+FALLBACK_TABLES = (
+    ("class containing 'table'", etree.XPath(f"//table[contains({_LOWER % '@class'}, 'table')]")),
+    # The outermost table around the first matching text is the first table that
+    # contains it, found with one pass over the text instead of one per table
+    ("table containing 'water level' text", etree.XPath(f"(//table//text()[contains({_LOWER % '.'}, 'water level')])[1]/ancestor::table[last()]")),
+    ("table with more than 5 rows", etree.XPath("//table[count(.//tr) > 5]")),
+)
+# Only the table's own rows and cells: a nested table's rows are not records,
+# and its cells would shift the date column of the row around it
+DATA_ROWS = etree.XPath('(tr | */tr)[count(td) >= 2]')
+ROW_CELLS = etree.XPath('td')
+
+# First rows of a table, only looked at when DEBUG logging is on
+HEADER_ROWS = etree.XPath('(tr | */tr)[position() <= 2]')
+HEADER_CELLS = etree.XPath('th | td')
+
+class GridRowTarget:
+    """
+    lxml parser target that collects the GridView1 rows while the page is parsed.
     
-    logging.error("All Indian proxies failed")
-    return None
+    No tree is built: only the text of the table's own cells is kept, for rows
+    with at least 2 of them. For a cell that wraps a nested table, the first
+    nested cell is used, like cell_text does for the fallback tables.
+    """
+    
+    def __init__(self):
+        self.rows = []
+        self._depth = 0  # 0 outside GridView1, 1 in it, >1 in nested tables
+        self._row = None
+        self._cell = None
+        self._capture = False
+        self._nested_done = False
+    
+    def start(self, tag, attrib):
+        if not self._depth:
+            if tag == 'table' and attrib.get('id') == 'GridView1':
+                self._depth = 1
+        elif tag == 'table':
+            self._depth += 1
+            if self._depth == 2 and self._cell is not None and not self._nested_done:
+                # Only the first cell of the first nested table holds the value
+                self._cell.clear()
+                self._capture = False
+                self._nested_done = False
+        elif self._depth == 1:
+            if tag == 'tr':
+                self._row = []
+            elif tag == 'td' and self._row is not None:
+                self._cell = []
+                self._capture = True
+        elif self._depth == 2 and tag == 'td' and self._cell is not None and not self._nested_done:
+            self._capture = True
+    
+    def end(self, tag):
+        if not self._depth:
+            return
+        if tag == 'table':
+            if self._depth == 2 and self._cell is not None:
+                # Later nested tables in the same cell are ignored, even if this one had no cells
+                self._nested_done = True
+                self._capture = False
+            self._depth -= 1
+        elif self._depth == 1:
+            if tag == 'td' and self._cell is not None:
+                self._row.append(''.join(self._cell).strip())
+                self._cell = None
+                self._capture = False
+            elif tag == 'tr' and self._row is not None:
+                # Header rows have no td cells, data rows have at least 2
+                if len(self._row) >= 2:
+                    self.rows.append(self._row)
+                self._row = None
+        elif self._depth == 2 and tag == 'td' and self._capture:
+            self._capture = False
+            self._nested_done = True
+    
+    def data(self, text):
+        if self._capture:
+            self._cell.append(text)
+    
+    def close(self):
+        return self.rows
+
+def parse_grid_rows(html_content, encoding=None):
+    """
+    Stream the GridView1 data rows out of a page without building a document tree.
+    
+    Args:
+        html_content (bytes): HTML of the page
+        encoding (str): Charset from the Content-Type header. Without one, lxml
+            goes by the page's meta tag
+    
+    Returns:
+        list: Cell texts of every row with at least 2 columns
+    """
+    parser = etree.HTMLParser(target=GridRowTarget(), encoding=encoding)
+    parser.feed(html_content)
+    return parser.close()
+
+def grid_rows_to_data(grid_rows):
+    """
+    Turn the cell texts from parse_grid_rows into water level records.
+    
+    Args:
+        grid_rows (list): Cell texts of the data rows
+    
+    Returns:
+        list: A list of dictionaries containing water level data
+    """
+    # Batch timestamp: taken once, so every row without a date/time gets the
+    # same value. Keep it out of the loop
+    current_datetime = datetime.now().isoformat(sep=' ', timespec='seconds')
+    
+    data = []
+    for cells in grid_rows:
+        location, water_level = cells[0], cells[1]
+        date_time = cells[2] if len(cells) > 2 else ""
+        
+        # A numeric third column is not a date/time
+        if _NUMERIC_RE.fullmatch(date_time):
+            logging.info(f"Third column appears to be numeric, not date/time for {location}")
+            date_time = ""
+        
+        data.append({
+            'Location': location,
+            'Water Level (Feet)': water_level,
+            'Date & Time': date_time or current_datetime
+        })
+    
+    return data
+
+def find_fallback_rows(html_content, encoding=None):
+    """
+    Find the water level rows of a page that has no GridView1 table.
+    
+    Args:
+        html_content (bytes): HTML of the page
+        encoding (str): Charset from the Content-Type header. Without one, lxml
+            goes by the page's meta tag
+    
+    Returns:
+        tuple: (approach used, cell texts of every row with at least 2 columns),
+            or (None, None) if no suitable table was found
+    """
+    tree = html.fromstring(html_content, parser=html.HTMLParser(encoding=encoding))
+    
+    for approach, find_tables in FALLBACK_TABLES:
+        tables = find_tables(tree)
+        if tables:
+            table = tables[0]
+            logging.info(f"Found table using {approach}")
+            break
+    else:
+        return None, None
+    
+    # Debug: Log table structure (skipped entirely unless DEBUG logging is on)
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("Analyzing table structure...")
+        for i, row in enumerate(HEADER_ROWS(table)):  # Check first 2 rows for headers
+            cols = HEADER_CELLS(row)
+            logging.debug(f"Header Row {i+1}: Found {len(cols)} columns")
+            for j, col in enumerate(cols):
+                logging.debug(f"  Column {j}: {col.text_content().strip()[:50]}")
+    
+    # Rows with fewer than 2 columns are dropped by DATA_ROWS itself
+    rows = [[cell_text(col) for col in ROW_CELLS(row)] for row in DATA_ROWS(table)]
+    
+    return approach, rows
+
+def cell_text(cell):
+    """Text of a cell, or of the first cell of a table nested in it"""
+    nested = cell.find('.//table')
+    if nested is None:
+        return cell.text_content().strip()
+    nested_cell = nested.find('.//td')
+    return nested_cell.text_content().strip() if nested_cell is not None else ""
+
+def get_chromedriver_path():
+    """Return the ChromeDriver binary, preferring one that is already installed"""
+    global _CHROMEDRIVER_PATH
+    
+    if _CHROMEDRIVER_PATH is None:
+        # A set but wrong CHROMEDRIVER_PATH still lets a chromedriver on PATH win
+        candidates = (os.environ.get('CHROMEDRIVER_PATH'), shutil.which('chromedriver'))
+        driver_path = next((path for path in candidates if path and os.path.isfile(path)), None)
+        if driver_path:
+            logging.info(f"Using installed ChromeDriver at {driver_path}")
+        else:
+            # Only hit the network for a driver download when none is installed
+            driver_path = ChromeDriverManager().install()
+        _CHROMEDRIVER_PATH = driver_path
+    
+    return _CHROMEDRIVER_PATH
 
 def setup_driver():
     """Set up the Chrome WebDriver with headless options."""
     if not SELENIUM_AVAILABLE:
         logging.error("Selenium is not available")
         return None
-        
+    
+    driver = start_chrome(CHROME_PROFILE_DIR)
+    if driver is None:
+        # A Chrome whose quit failed still holds the lock on the shared profile,
+        # so fall back to a throwaway one instead of failing every relaunch
+        profile_dir = tempfile.mkdtemp(prefix="vmc-scraper-chrome-")
+        atexit.register(shutil.rmtree, profile_dir, ignore_errors=True)
+        logging.warning(f"Retrying WebDriver setup with a temporary profile in {profile_dir}")
+        driver = start_chrome(profile_dir)
+    return driver
+
+def start_chrome(profile_dir):
+    """
+    Launch headless Chrome on the given profile.
+    
+    Args:
+        profile_dir (str): Chrome user data directory, its disk cache goes in a subdirectory
+    
+    Returns:
+        WebDriver: The driver, or None if Chrome could not be started
+    """
     chrome_options = Options()
     chrome_options.add_argument("--headless")  # Run in background
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")  # Images are not needed for the table
     chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36")
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+    })
+    chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+    chrome_options.add_argument(f"--disk-cache-dir={os.path.join(profile_dir, 'cache')}")
+    # Return from driver.get at DOMContentLoaded, the WebDriverWait covers the table
+    chrome_options.page_load_strategy = 'eager'
+    # Network events let the page HTML be read back without serialising the DOM
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
     
     # Install and set up the driver
     try:
-        service = Service(ChromeDriverManager().install())
+        service = Service(get_chromedriver_path())
         driver = webdriver.Chrome(service=service, options=chrome_options)
+        
+        # Block static resources so they don't compete with the page itself
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_URLS})
+        except Exception as e:
+            logging.warning(f"Could not block static resources: {str(e)}")
+        
         return driver
     except Exception as e:
         logging.error(f"Failed to setup WebDriver: {str(e)}")
         return None
 
-def scrape_with_selenium():
+def get_response_body(driver, url):
+    """
+    Read the HTML Chrome received for a page from its network log.
+    
+    Args:
+        driver: WebDriver that loaded the page
+        url (str): Address of the page
+    
+    Returns:
+        str: Response body of the latest load of the page, or None if it is not available
+    """
+    try:
+        # Reading the log also drains it, so earlier attempts do not pile up
+        request_id = None
+        content_type = None
+        for entry in driver.get_log('performance'):
+            # Most entries are other network events, skip them before decoding the JSON
+            if '"Network.responseReceived"' not in entry['message']:
+                continue
+            message = json.loads(entry['message'])['message']
+            if message['method'] != 'Network.responseReceived':
+                continue
+            params = message['params']
+            if params.get('type') == 'Document' and params['response']['url'].lower() == url.lower():
+                request_id = params['requestId']
+                headers = params['response'].get('headers', {})
+                content_type = next((value for key, value in headers.items() if key.lower() == 'content-type'), None)
+        
+        if request_id is None:
+            return None
+        
+        response = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        if response.get('base64Encoded'):
+            # Raw bytes, decode them with the header charset when there is one
+            body = base64.b64decode(response['body'])
+            charset = header_charset(content_type)
+            return body.decode(charset, errors='replace') if charset else body
+        return response['body']
+    except Exception as e:
+        logging.warning(f"Could not read the response body from Chrome: {str(e)}")
+        return None
+
+def scrape_with_selenium(driver):
     """
     Scrape water level data from VMC website using Selenium.
     
+    Args:
+        driver: WebDriver to load the page with. It is reused across retries
+            and quit by the caller.
+    
     Returns:
         list: A list of dictionaries containing water level data
+    
+    Raises:
+        WebDriverException: If the browser itself failed and needs a restart
     """
     if not SELENIUM_AVAILABLE:
         logging.warning("Selenium not available, skipping this method")
@@ -332,418 +882,284 @@ def scrape_with_selenium():
     url = "https://vmc.gov.in/waterlevelsensor/WaterLevel.aspx"
     
     try:
-        logging.info("Setting up WebDriver")
-        driver = setup_driver()
-        
-        if not driver:
-            logging.error("Failed to setup WebDriver")
-            return None
+        # Start every attempt from a clean session on the reused browser
+        driver.delete_all_cookies()
         
         logging.info(f"Accessing {url}")
         driver.get(url)
         
-        # Wait for the page to load and for the table to be visible
-        logging.info("Waiting for page to load...")
-        time.sleep(5)  # Initial wait for page load
-        
-        # Switch to iframe if present
-        iframes = driver.find_elements(By.TAG_NAME, "iframe")
-        if iframes:
-            logging.info(f"Found {len(iframes)} iframes. Switching to the first one.")
-            driver.switch_to.frame(iframes[0])
-        
-        # Try to wait for the table to be present
+        # Wait for the table itself instead of sleeping for a fixed time
+        logging.info("Waiting for table to load...")
         try:
-            WebDriverWait(driver, 30).until(
+            WebDriverWait(driver, 15).until(
                 EC.presence_of_element_located((By.ID, "GridView1"))
             )
             logging.info("Found table with id 'GridView1'")
-        except Exception as e:
-            logging.warning(f"Could not find table with id 'GridView1': {str(e)}")
+            
+            # The table is server-rendered, so the HTML Chrome received already
+            # holds it and the DOM does not need to be serialised
+            body = get_response_body(driver, url)
+            if body and DEBUG_HTML:
+                save_debug_html(body)
+            grid_rows = parse_grid_rows(body) if body else None
+            if grid_rows:
+                data = grid_rows_to_data(grid_rows)
+                logging.info(f"Successfully extracted data for {len(data)} locations from the response body")
+                return data
+        except TimeoutException:
+            # The table may be rendered inside an iframe
+            iframes = driver.find_elements(By.TAG_NAME, "iframe")
+            logging.info(f"Table not in main document, checking {len(iframes)} iframes")
+            for i, iframe in enumerate(iframes):
+                driver.switch_to.frame(iframe)
+                try:
+                    WebDriverWait(driver, 5).until(
+                        EC.presence_of_element_located((By.ID, "GridView1"))
+                    )
+                    logging.info(f"Found table with id 'GridView1' in iframe {i+1}")
+                    break
+                except TimeoutException:
+                    driver.switch_to.default_content()
+            else:
+                logging.warning("Could not find table with id 'GridView1'")
         
         # Get the page source after JavaScript execution
         page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'html.parser')
-        
-        # Save the HTML content for debugging (only in local environment)
-        if os.environ.get('GITHUB_ACTIONS') != 'true':
-            debug_file = os.path.join(OUTPUT_DIR, "debug_page.html")
-            os.makedirs(OUTPUT_DIR, exist_ok=True)
-            with open(debug_file, 'w', encoding='utf-8') as f:
-                f.write(page_source)
-            logging.info(f"Saved page content to {debug_file} for debugging")
-        
-        # Try to find the table with different approaches
-        table = None
-        
-        # Approach 1: Original method
-        table = soup.find('table', {'id': 'GridView1'})
-        if table:
-            logging.info("Found table using original method (id='GridView1')")
-        else:
-            # Approach 2: Find any table with similar attributes
-            logging.info("Original method failed, trying alternative approaches")
-            table = soup.find('table', {'class': lambda x: x and 'table' in x.lower()})
-            if table:
-                logging.info("Found table using class containing 'table'")
-            else:
-                # Approach 3: Find all tables and look for one with water level data
-                tables = soup.find_all('table')
-                logging.info(f"Found {len(tables)} tables on the page")
-                
-                for i, t in enumerate(tables):
-                    # Check if this table contains water level data
-                    if t.find(text=lambda x: x and 'water level' in x.lower()):
-                        table = t
-                        logging.info(f"Found table containing 'water level' text (table {i+1})")
-                        break
-                
-                if not table:
-                    # Approach 4: Look for any table with multiple rows
-                    for i, t in enumerate(tables):
-                        rows = t.find_all('tr')
-                        if len(rows) > 5:  # Arbitrary threshold for "enough" rows
-                            table = t
-                            logging.info(f"Found table with {len(rows)} rows (table {i+1})")
-                            break
-        
-        if not table:
-            logging.error("Could not find any suitable table with water level data")
-            driver.quit()
-            return None
-        
-        # Debug: Log table structure
-        logging.info("Analyzing table structure...")
-        header_rows = table.find_all('tr')[:2]  # Check first 2 rows for headers
-        for i, row in enumerate(header_rows):
-            cols = row.find_all(['th', 'td'])
-            logging.info(f"Header Row {i+1}: Found {len(cols)} columns")
-            for j, col in enumerate(cols):
-                col_text = col.text.strip()[:50]  # Limit to 50 chars for readability
-                logging.info(f"  Column {j}: {col_text}")
-        
-        # Extract data
-        data = []
-        rows = table.find_all('tr')
-        
-        # Skip header rows - we need to determine how many to skip
-        # Let's look for rows that contain actual data
-        data_rows = []
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) >= 2:  # Only consider rows with at least 2 columns
-                data_rows.append(row)
-        
-        if not data_rows:
-            logging.warning("No data rows found in the table")
-            driver.quit()
-            return None
-        
-        logging.info(f"Found {len(data_rows)} data rows")
         
-        # Get current date/time for fallback
-        current_datetime = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Save the HTML content for debugging (opt in with SCRAPE_DEBUG=1 or --debug-html)
+        if DEBUG_HTML:
+            save_debug_html(page_source)
         
-        for i, row in enumerate(data_rows):
-            try:
-                cols = row.find_all('td')
-                
-                if len(cols) < 2:
-                    logging.warning(f"Row {i+1} doesn't have enough columns, skipping")
-                    continue
-                
-                # Extract location
-                location = cols[0].text.strip()
-                
-                # Extract water level (it might be in a nested structure)
-                water_level = ""
-                # Try different ways to extract water level
-                if cols[1].find('table'):
-                    water_level_table = cols[1].find('table')
-                    water_level_td = water_level_table.find('td')
-                    if water_level_td:
-                        water_level = water_level_td.text.strip()
-                else:
-                    water_level = cols[1].text.strip()
-                
-                # Extract date and time
-                date_time = ""
-                
-                # Check if there's a third column
-                if len(cols) > 2:
-                    # Try to extract from third column
-                    if cols[2].find('table'):
-                        date_time_table = cols[2].find('table')
-                        date_time_td = date_time_table.find('td')
-                        if date_time_td:
-                            date_time = date_time_td.text.strip()
-                    else:
-                        date_time = cols[2].text.strip()
-                    
-                    # Check if the extracted value looks like a date/time
-                    # If it's numeric, it's probably not a date/time
-                    if re.match(r'^[\d.]+$', date_time):
-                        logging.info(f"Third column appears to be numeric, not date/time for {location}")
-                        date_time = current_datetime
-                else:
-                    # No third column, use current date/time
-                    date_time = current_datetime
-                
-                # If we still don't have a date_time value, use current date and time
-                if not date_time:
-                    date_time = current_datetime
-                
-                data.append({
-                    'Location': location,
-                    'Water Level (Feet)': water_level,
-                    'Date & Time': date_time
-                })
-                
-                # Log the extracted values for debugging
-                logging.debug(f"Row {i+1}: Location='{location}', Water Level='{water_level}', Date/Time='{date_time}'")
-                
-            except Exception as e:
-                logging.error(f"Error processing row {i+1}: {str(e)}")
-                continue
-        
-        logging.info(f"Successfully extracted data for {len(data)} locations")
-        driver.quit()
-        return data
+        # Same extraction as the plain HTTP strategies
+        return extract_data_from_html(page_source)
     
+    except WebDriverException:
+        raise
     except Exception as e:
         logging.error(f"Unexpected error with Selenium: {str(e)}")
-        try:
-            driver.quit()
-        except:
-            pass
         return None
 
-def extract_data_from_html(html_content):
-    """Extract water level data from HTML content"""
+def extract_data_from_html(html_content, encoding=None):
+    """
+    Extract water level data from HTML content.
+    
+    Args:
+        html_content (bytes or str): HTML of the page
+        encoding (str): Charset from the Content-Type header, for bytes content
+    
+    Returns:
+        list: A list of dictionaries containing water level data, or None
+    """
     try:
-        from bs4 import BeautifulSoup
-        
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Try to find the table with different approaches
-        table = None
-        approach_used = None
+        # Approach 1: Try to find table with id 'GridView1', streamed with lxml
+        # so no tree is built when the page has the expected layout
+        grid_rows = parse_grid_rows(html_content, encoding)
+        if grid_rows:
+            logging.info(f"Found table using id='GridView1' with {len(grid_rows)} data rows")
+            data = grid_rows_to_data(grid_rows)
+            logging.info(f"Successfully extracted data for {len(data)} locations using id='GridView1'")
+            return data
         
-        # Approach 1: Try to find table with id 'GridView1'
-        table = soup.find('table', {'id': 'GridView1'})
-        if table:
-            approach_used = "id='GridView1'"
-            logging.info(f"Found table using {approach_used}")
-        else:
-            # Approach 2: Find any table with similar attributes
-            table = soup.find('table', {'class': lambda x: x and 'table' in x.lower()})
-            if table:
-                approach_used = "class containing 'table'"
-                logging.info(f"Found table using {approach_used}")
-            else:
-                # Approach 3: Find all tables and look for one with water level data
-                tables = soup.find_all('table')
-                for i, t in enumerate(tables):
-                    if t.find(text=lambda x: x and 'water level' in x.lower()):
-                        table = t
-                        approach_used = f"table containing 'water level' text (table {i+1})"
-                        logging.info(f"Found table using {approach_used}")
-                        break
-                
-                if not table:
-                    # Approach 4: Look for any table with multiple rows
-                    for i, t in enumerate(tables):
-                        rows = t.find_all('tr')
-                        if len(rows) > 5:  # Arbitrary threshold for "enough" rows
-                            table = t
-                            approach_used = f"table with {len(rows)} rows (table {i+1})"
-                            logging.info(f"Found table using {approach_used}")
-                            break
-        
-        if not table:
+        # Approaches 2-4: look for another table that holds the readings
+        approach, rows = find_fallback_rows(html_content, encoding)
+        if approach is None:
             logging.error("Could not find any suitable table with water level data")
             return None
         
-        # Extract data from table
-        data = []
-        rows = table.find_all('tr')
-        
-        # Skip header rows - we need to determine how many to skip
-        # Let's look for rows that contain actual data
-        data_rows = []
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) >= 2:  # Only consider rows with at least 2 columns
-                data_rows.append(row)
-        
-        if not data_rows:
+        if not rows:
             logging.warning("No data rows found in the table")
             return None
         
-        logging.info(f"Found {len(data_rows)} data rows")
-        
-        # Get current date/time for fallback
-        current_datetime = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        for i, row in enumerate(data_rows):
-            try:
-                cols = row.find_all('td')
-                
-                if len(cols) < 2:
-                    logging.warning(f"Row {i+1} doesn't have enough columns, skipping")
-                    continue
-                
-                # Extract location
-                location = cols[0].text.strip()
-                
-                # Extract water level (it might be in a nested structure)
-                water_level = ""
-                if cols[1].find('table'):
-                    water_level_table = cols[1].find('table')
-                    water_level_td = water_level_table.find('td')
-                    if water_level_td:
-                        water_level = water_level_td.text.strip()
-                else:
-                    water_level = cols[1].text.strip()
-                
-                # Extract date and time
-                date_time = ""
-                
-                # Check if there's a third column
-                if len(cols) > 2:
-                    if cols[2].find('table'):
-                        date_time_table = cols[2].find('table')
-                        date_time_td = date_time_table.find('td')
-                        if date_time_td:
-                            date_time = date_time_td.text.strip()
-                    else:
-                        date_time = cols[2].text.strip()
-                    
-                    # Check if the extracted value looks like a date/time
-                    if re.match(r'^[\d.]+$', date_time):
-                        logging.info(f"Third column appears to be numeric, not date/time for {location}")
-                        date_time = current_datetime
-                else:
-                    # No third column, use current date/time
-                    date_time = current_datetime
-                
-                # If we still don't have a date_time value, use current date and time
-                if not date_time:
-                    date_time = current_datetime
-                
-                data.append({
-                    'Location': location,
-                    'Water Level (Feet)': water_level,
-                    'Date & Time': date_time
-                })
-                
-            except Exception as e:
-                logging.error(f"Error processing row {i+1}: {str(e)}")
-                continue
-        
-        logging.info(f"Successfully extracted data for {len(data)} locations using {approach_used}")
+        logging.info(f"Found {len(rows)} data rows")
+        data = grid_rows_to_data(rows)
+        logging.info(f"Successfully extracted data for {len(data)} locations using {approach}")
         return data
         
     except Exception as e:
         logging.error(f"Error extracting data from HTML: {str(e)}")
         return None
 
+def scrape_with(fetch):
+    """Extract data from the page returned by a fetch strategy, or None if it returned nothing"""
+    page = fetch()
+    if not page:
+        return None
+    if DEBUG_HTML:
+        save_debug_html(page[0])
+    return extract_data_from_html(*page)
+
+def scrape_with_targeted_request():
+    """
+    Extract data from the targeted request, posting the form back when the grid is missing.
+    
+    Returns:
+        list: A list of dictionaries containing water level data, or None
+    """
+    page = try_with_targeted_request()
+    if not page:
+        return None
+    if DEBUG_HTML:
+        save_debug_html(page[0])
+    
+    data = extract_data_from_html(*page)
+    if data:
+        return data
+    
+    # The page loaded without the grid, post the form back before
+    # falling through to the browser
+    page = try_with_postback(*page)
+    if page:
+        if DEBUG_HTML:
+            save_debug_html(page[0])
+        data = extract_data_from_html(*page)
+        if data:
+            logging.info("Successfully extracted data using ASP.NET postback")
+            return data
+    
+    return None
+
+def load_last_strategy():
+    """
+    Read the strategy that last returned data from the cache file.
+    
+    Returns:
+        str: Name of the strategy, or None if there is no fresh entry
+    """
+    try:
+        with open(STRATEGY_CACHE_FILE, encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    # A hand-edited or corrupt file must not break the run
+    if not isinstance(entry, dict):
+        return None
+    try:
+        if time.time() - entry.get('saved_at', 0) > STRATEGY_CACHE_TTL:
+            return None
+    except TypeError:
+        return None
+    strategy = entry.get('strategy')
+    return strategy if isinstance(strategy, str) else None
+
+def save_last_strategy(strategy):
+    """Record the strategy that returned data so the next run tries it first"""
+    try:
+        os.makedirs(os.path.dirname(STRATEGY_CACHE_FILE), exist_ok=True)
+        with open(STRATEGY_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'strategy': strategy, 'saved_at': time.time()}, f)
+    except OSError as e:
+        logging.warning(f"Could not save strategy cache: {str(e)}")
+
 def generate_mock_data():
     """Generate mock water level data when the website is not accessible"""
     logging.info("Generating mock data as fallback")
     
-    # List of locations from the original table
-    locations = [
-        "AJWA DAM",
-        "AKOTA BRIDGE",
-        "ASOJ FEEDER",
-        "BAHUCHARAJI BRIDGE",
-        "KALA GHODA",
-        "MANGAL PANDEY BRIDGE",
-        "MUJMAUDA BRIDGE",
-        "PRATAPPURA DAM",
-        "SAMA HARNI BRIDGE",
-        "VADSAR BRIDGE"
-    ]
-    
     # Generate current date and time
     current_datetime = datetime.now().strftime('%d-%m-%Y %H:%M:%S')
     
+    # Generate random water levels between 0 and 250 feet
+    water_levels = [round(random.uniform(0, 250), 2) for _ in _MOCK_LOCATIONS]
+    
     # Generate mock data
-    data = []
-    for location in locations:
-        # Generate random water level between 0 and 250 feet
-        water_level = round(random.uniform(0, 250), 2)
-        
-        data.append({
+    data = [
+        {
             'Location': location,
             'Water Level (Feet)': str(water_level),
             'Date & Time': current_datetime
-        })
+        }
+        for location, water_level in zip(_MOCK_LOCATIONS, water_levels)
+    ]
     
     logging.info(f"Generated mock data for {len(data)} locations")
     return data
 
-def scrape_water_level_data(max_retries=2):
+def scrape_water_level_data(max_retries=2, mock_fallback=True):
     """
     Scrape water level data using multiple methods.
     
     Args:
         max_retries (int): Maximum number of retry attempts
+        mock_fallback (bool): Return mock data when every attempt fails, instead of an empty list
     
     Returns:
         list: A list of dictionaries containing water level data
     """
-    for attempt in range(max_retries + 1):
-        try:
-            logging.info(f"=== Attempt {attempt + 1}/{max_retries + 1} ===")
-            
-            # Try with targeted request first (most likely to work)
-            logging.info("Trying with targeted request parameters")
-            content = try_with_targeted_request()
-            if content:
-                # Try to extract data from HTML
-                data = extract_data_from_html(content)
-                if data:
-                    logging.info("Successfully extracted data using targeted request")
-                    return data
-            
-            # Try with IP address
-            logging.info("Trying with specific IP address")
-            content = try_with_ip_address()
-            if content:
-                # Try to extract data from HTML
-                data = extract_data_from_html(content)
-                if data:
-                    logging.info("Successfully extracted data using IP address")
-                    return data
-            
-            # Try with Indian proxy
-            logging.info("Trying with Indian proxy")
-            content = try_with_indian_proxy()
-            if content:
-                # Try to extract data from HTML
-                data = extract_data_from_html(content)
-                if data:
-                    logging.info("Successfully extracted data using Indian proxy")
-                    return data
-            
-            # Try Selenium (if available)
-            if SELENIUM_AVAILABLE:
-                logging.info("Trying Selenium")
-                data = scrape_with_selenium()
+    driver = None
+    
+    try:
+        for attempt in range(max_retries + 1):
+            try:
+                logging.info(f"=== Attempt {attempt + 1}/{max_retries + 1} ===")
+                
+                strategies = {
+                    "targeted request": scrape_with_targeted_request,
+                    "IP address": lambda: scrape_with(try_with_ip_address),
+                    "Indian proxy": lambda: scrape_with(try_with_indian_proxy),
+                }
+                
+                # Go straight to the strategy that worked last time before probing them all.
+                # The targeted request always runs alongside it, so one slow direct
+                # answer can't pin a fallback as the only first choice
+                last_strategy = load_last_strategy()
+                if last_strategy in strategies:
+                    logging.info(f"Trying {last_strategy}, which worked on the last run")
+                    first = {name: strategies.pop(name) for name in dict.fromkeys(("targeted request", last_strategy))}
+                    method, data = first_successful(list(first.items()))
+                    if data:
+                        logging.info(f"Successfully extracted data using {method}")
+                        save_last_strategy(method)
+                        return data
+                
+                # Race the plain HTTP strategies, the first to yield data wins
+                logging.info(f"Trying {', '.join(strategies)} concurrently")
+                method, data = first_successful(list(strategies.items()))
                 if data:
-                    logging.info("Successfully extracted data using Selenium")
+                    logging.info(f"Successfully extracted data using {method}")
+                    save_last_strategy(method)
                     return data
-            
-            logging.warning("All methods failed in this attempt")
-            
-        except Exception as e:
-            logging.error(f"Unexpected error: {str(e)}")
-            if attempt < max_retries:
-                logging.info("Retrying in 10 seconds...")
-                time.sleep(10)
-            continue
+                
+                # Try Selenium (if available), reusing the browser from earlier attempts
+                if SELENIUM_AVAILABLE:
+                    logging.info("Trying Selenium")
+                    if driver is None:
+                        logging.info("Setting up WebDriver")
+                        driver = setup_driver()
+                    if driver:
+                        try:
+                            data = scrape_with_selenium(driver)
+                        except WebDriverException as e:
+                            # Only a broken browser is torn down and relaunched
+                            logging.error(f"WebDriver error, restarting browser: {str(e)}")
+                            try:
+                                driver.quit()
+                            except Exception:
+                                pass
+                            driver = None
+                            data = None
+                        if data:
+                            logging.info("Successfully extracted data using Selenium")
+                            return data
+                    else:
+                        logging.error("Failed to setup WebDriver")
+                
+                logging.warning("All methods failed in this attempt")
+                
+            except Exception as e:
+                logging.error(f"Unexpected error: {str(e)}")
+                if attempt < max_retries:
+                    # Exponential backoff with jitter between whole attempts
+                    delay = min(30, 2 ** (attempt + 1)) + random.uniform(0, 1)
+                    logging.info(f"Retrying in {delay:.1f} seconds...")
+                    time.sleep(delay)
+                continue
+    finally:
+        if driver:
+            driver.quit()
+    
+    if not mock_fallback:
+        logging.warning("All attempts failed")
+        return []
     
     # If we get here, all retries failed, generate mock data
     logging.warning("All attempts failed, generating mock data as fallback")
@@ -766,33 +1182,104 @@ def save_to_csv(data, filename=None):
     
     if filename is None:
         # Generate filename with current date
-        today = datetime.now().strftime('%Y-%m-%d')
+        today = datetime.now().date().isoformat()
         filename = f"water_level_data_{today}.csv"
     
     # Create output directory if it doesn't exist
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    ensure_output_dir()
     
     # Save to CSV
     file_path = os.path.join(OUTPUT_DIR, filename)
+    tmp_path = file_path + '.tmp'
+    try:
+        # One 64 KiB buffer holds the whole file, so it is written in a single flush.
+        # The file is swapped in whole, so readers never see a partly written CSV
+        with open(tmp_path, 'w', buffering=1 << 16, newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(data)
+        os.replace(tmp_path, file_path)
+        logging.info(f"Data saved to {file_path} ({len(data)} rows)")
+        return file_path
+    except Exception as e:
+        logging.error(f"Error saving data to CSV: {str(e)}")
+        # Don't leave the partial file behind for the workflow to commit
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+
+def save_to_parquet(data, filename=None):
+    """
+    Save water level data to a zstd-compressed Parquet file for downstream analysis.
+    
+    Args:
+        data (list): List of dictionaries containing water level data
+        filename (str, optional): Name of the Parquet file. If None, generates based on current date.
+    
+    Returns:
+        str: Path to the created Parquet file
+    """
+    if not data:
+        logging.warning("No data to save")
+        return None
+    
+    if filename is None:
+        # Generate filename with current date
+        today = datetime.now().date().isoformat()
+        filename = f"water_level_data_{today}.parquet"
+    
+    # Create output directory if it doesn't exist
+    ensure_output_dir()
+    
+    # Save to Parquet
+    file_path = os.path.join(OUTPUT_DIR, filename)
     try:
-        df = pd.DataFrame(data)
-        logging.info(f"DataFrame shape: {df.shape}")
-        logging.info(f"DataFrame columns: {list(df.columns)}")
-        logging.info(f"First few rows:\n{df.head()}")
+        # Only the optional Parquet output needs pandas, so it is imported here
+        import pandas as pd
         
-        df.to_csv(file_path, index=False)
+        df = pd.DataFrame.from_records(data, columns=CSV_COLUMNS)
+        # Store the readings as numbers so readers don't re-parse strings;
+        # anything that isn't a number becomes NaN
+        df['Water Level (Feet)'] = pd.to_numeric(df['Water Level (Feet)'], errors='coerce')
+        df.to_parquet(file_path, compression='zstd', index=False)
         logging.info(f"Data saved to {file_path}")
         return file_path
+    except ImportError as e:
+        logging.error(f"Parquet output needs pyarrow installed: {str(e)}")
+        return None
     except Exception as e:
-        logging.error(f"Error saving data to CSV: {str(e)}")
+        logging.error(f"Error saving data to Parquet: {str(e)}")
         return None
 
-def main():
-    """Main function to scrape and save water level data."""
+def parse_args(argv=None):
+    """Parse the command line options"""
+    parser = argparse.ArgumentParser(description="Scrape VMC water level data into data/")
+    parser.add_argument('--debug-html', action='store_true', help="save the fetched page to data/debug_page.html")
+    parser.add_argument('--verbose', action='store_true', help="log at DEBUG level")
+    return parser.parse_args(argv)
+
+def main(argv=None, mock_fallback=True):
+    """
+    Main function to scrape and save water level data.
+    
+    Args:
+        argv (list): Command line arguments, sys.argv[1:] when None
+        mock_fallback (bool): Save mock data when scraping fails, instead of exiting with an error
+    """
+    global DEBUG_HTML
+    
+    args = parse_args(argv)
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    if args.debug_html:
+        DEBUG_HTML = True
+    
     logging.info("=== Starting water level data scraping process ===")
     
     # Try scraping with multiple methods
-    data = scrape_water_level_data()
+    data = scrape_water_level_data(mock_fallback=mock_fallback)
     
     if not data:
         logging.error("All scraping methods failed, exiting")
@@ -803,6 +1290,10 @@ def main():
         logging.error("Failed to save data, exiting")
         sys.exit(1)
     
+    # Optional columnar copy for downstream jobs; the CSV stays the primary output
+    if os.environ.get('SAVE_PARQUET') == '1':
+        save_to_parquet(data)
+    
     logging.info("=== Process completed successfully ===")
 
 if __name__ == "__main__":